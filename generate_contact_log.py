@@ -21,12 +21,52 @@ portability – it only relies on Python’s standard library.
 """
 
 import argparse
+import codecs
 import csv
 import html
+import io
 import json
+import mmap
+import os
+import re
+import stat
+import string
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+
+# Splits a header such as "日期DATE" into the part before the first
+# uppercase letter and the English abbreviation that follows it.
+_HEADER_SPLIT = re.compile(r'^(.*?)([A-Z].*)$', re.DOTALL)
+
+# Single-pass equivalent of html.escape(value, quote=True) for table cells.
+_HTML_TRANS = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+# Optional profile entries shown after CALL and CLASS, as (config key, label).
+PROFILE_FIELDS = [
+    ("operator", "OPR"),
+    ("location", "QTH"),
+    ("grid", "GRID"),
+    ("email", "EMAIL"),
+]
+
+# Pre-encoded markup around each table row and cell.
+_TR_OPEN = b"                <tr>"
+_TR_CLOSE = b"</tr>\n"
+_TD_OPEN = b"<td>"
+_TD_CLOSE = b"</td>"
+_FLUSH_SIZE = 1 << 20
+
+
+def _esc(value: str) -> str:
+    return value.translate(_HTML_TRANS)
 
 
 def parse_args() -> argparse.Namespace:
@@ -43,116 +83,80 @@ def load_config(config_path: Path) -> dict:
             config = json.load(f)
     except Exception as exc:
         raise SystemExit(f"Failed to load configuration from {config_path}: {exc}")
-    # Normalise keys to lower case for convenience
+    # Keys are looked up in lower case.  The usual config already uses
+    # lower-case keys, so only build a normalised copy when it does not.
+    if all(k.islower() for k in config):
+        return config
     return {k.lower(): v for k, v in config.items()}
 
 
-def read_csv(csv_path: Path) -> list:
-    """Read the CSV file and return a list of ordered dictionaries.
+def _read_text(path: Path) -> str:
+    """Return the UTF-8 contents of *path*, without a leading BOM.
+
+    Regular files are memory-mapped and decoded in one go straight from
+    the mapped pages, rather than read line by line through a text
+    wrapper or copied into an intermediate bytes object first.  Pipes
+    and other non-regular files are read in full instead.
+    """
+    bom = codecs.BOM_UTF8
+    with path.open("rb") as f:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode):
+            raw = f.read()
+            if raw.startswith(bom):
+                raw = raw[len(bom):]
+            return raw.decode("utf-8")
+        # Zero-length files cannot be mapped.
+        if st.st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = len(bom) if mm[:len(bom)] == bom else 0
+            with memoryview(mm)[start:] as view:
+                return str(view, "utf-8")
+
+
+def read_csv(csv_path: Path) -> Tuple[List[str], List[List[str]]]:
+    """Read the CSV file and return its headers and rows.
 
     The script expects the CSV header row to define the order of
     columns.  Whitespace in header names is stripped and used to
-    construct table headings.  Rows are returned in the order they
-    appear in the file.
+    construct table headings.  Each row is a list of raw cell values
+    aligned positionally with the headers (short rows are padded with
+    empty strings, extra trailing cells are dropped); cell whitespace is
+    stripped later, when the value is rendered.  Rows are
+    returned in the order they appear in the file.
     """
     try:
-        with csv_path.open("r", encoding="utf-8-sig", newline="") as f:
-            reader = csv.reader(f)
-            try:
-                headers = next(reader)
-            except StopIteration:
-                return []
-            # Strip whitespace around header names
-            headers = [h.strip() for h in headers]
-            rows = []
-            for row in reader:
-                # If row is shorter than headers, pad with empty strings
-                if len(row) < len(headers):
-                    row += ["" for _ in range(len(headers) - len(row))]
-                entry = {headers[i]: row[i].strip() for i in range(len(headers))}
-                rows.append(entry)
-            return rows
+        reader = csv.reader(io.StringIO(_read_text(csv_path), newline=""))
+        try:
+            headers = next(reader)
+        except StopIteration:
+            return [], []
+        # Strip whitespace around header names
+        headers = [h.strip() for h in headers]
+        width = len(headers)
+        rows = []
+        for row in reader:
+            # Well-formed rows need no fix-up; only short rows are padded
+            # with empty strings and over-long rows trimmed.
+            if len(row) != width:
+                if len(row) < width:
+                    row += [""] * (width - len(row))
+                else:
+                    del row[width:]
+            rows.append(row)
+        return headers, rows
     except FileNotFoundError:
         raise SystemExit(f"CSV file not found: {csv_path}")
     except Exception as exc:
         raise SystemExit(f"Error reading CSV file {csv_path}: {exc}")
 
 
-def build_html(rows: list, config: dict) -> str:
-    """Construct the HTML page as a single string.
-
-    :param rows: A list of dictionaries representing contact log entries.
-    :param config: Station configuration with at least 'callsign' and 'license'.
-    :return: The complete HTML document.
-    """
-    callsign = html.escape(str(config.get("callsign", "")).upper())
-    license_class = html.escape(str(config.get("license", "")))
-    operator = html.escape(str(config.get("operator", "")))
-    location = html.escape(str(config.get("location", "")))
-    grid = html.escape(str(config.get("grid", "")))
-    email = html.escape(str(config.get("email", "")))
-
-    # Derive table headings and display names.  If a header contains
-    # English names (e.g. "DATE"), insert a space before the English
-    # part.  Otherwise leave as is.  This simple heuristic assumes
-    # uppercase letters denote the English abbreviation.
-    if rows:
-        headers = list(rows[0].keys())
-    else:
-        headers = []
-
-    def prettify(header: str) -> str:
-        """Insert a space between the Chinese portion and the English abbreviation.
-
-        Headers in the CSV use a convention such as "日期DATE" or "模式MODE".
-        This function detects the first uppercase sequence and inserts a
-        single space before it.  If the header already contains spaces
-        (e.g. "Sent RST"), it is returned unchanged.
-        """
-        header = header.strip()
-        # If there's already a space, assume it's formatted correctly
-        if ' ' in header:
-            return ' '.join(header.split())
-        import re
-        m = re.search(r'[A-Z]', header)
-        if not m:
-            return header
-        pos = m.start()
-        chinese = header[:pos].strip()
-        english = header[pos:].strip()
-        if chinese:
-            return f"{chinese} {english}"
-        # If the English part starts at index 0, return as is
-        return english
-
-    display_headers = [prettify(h) for h in headers]
-
-    # Build table header HTML
-    header_html_parts = []
-    for idx, name in enumerate(display_headers):
-        header_html_parts.append(f'<th onclick="sortTable({idx})">{html.escape(name)}</th>')
-    header_html = "\n                ".join(header_html_parts)
-
-    # Build table body HTML
-    row_html_parts = []
-    for row in rows:
-        cells = []
-        for h in headers:
-            value = row.get(h, "")
-            value = html.escape(value)
-            cells.append(f"<td>{value}</td>")
-        row_html_parts.append("                <tr>" + "".join(cells) + "</tr>")
-    body_html = "\n".join(row_html_parts)
-
-    # Compose the final HTML document
-    # Prebuild optional profile lines outside the template to avoid nested f-strings
-    operator_line = f"<li><strong>OPR:</strong> {operator}</li>" if operator else ""
-    location_line = f"<li><strong>QTH:</strong> {location}</li>" if location else ""
-    grid_line = f"<li><strong>GRID:</strong> {grid}</li>" if grid else ""
-    email_line = f"<li><strong>EMAIL:</strong> {email}</li>" if email else ""
-    # Construct the HTML document using str.format.  Double braces escape literal braces.
-    year = datetime.now().year
-    template = """<!DOCTYPE html>
+# The page template, written in str.format syntax.  Double braces escape
+# literal braces.  It is split around the table body so rows can be
+# streamed straight to the output file, and each half is pre-parsed
+# into literal chunks below.
+TEMPLATE = """<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="utf-8">
@@ -248,10 +252,7 @@ def build_html(rows: list, config: dict) -> str:
             <ul>
                 <li><strong>CALL:</strong> {callsign}</li>
                 <li><strong>CLASS:</strong> {license_class}</li>
-                {operator_line}
-                {location_line}
-                {grid_line}
-                {email_line}
+                {profile_lines}
             </ul>
         </section>
         <section class="log">
@@ -264,8 +265,7 @@ def build_html(rows: list, config: dict) -> str:
                         </tr>
                     </thead>
                     <tbody>
-{body_html}
-                    </tbody>
+{body_html}                    </tbody>
                 </table>
             </div>
         </section>
@@ -351,18 +351,208 @@ def build_html(rows: list, config: dict) -> str:
     </script>
 </body>
 </html>"""
-    html_doc = template.format(
-        callsign=callsign,
-        license_class=license_class,
-        operator_line=operator_line,
-        location_line=location_line,
-        grid_line=grid_line,
-        email_line=email_line,
-        header_html=header_html,
-        body_html=body_html,
-        year=year
+
+
+def _compile_template(template: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Split a str.format template into (literal, field name) pairs.
+
+    Parsing happens once at import time, so rendering is a plain join
+    that never rescans the template's escaped CSS and script braces.
+    The field name is None for a trailing literal.
+    """
+    return tuple((literal, field) for literal, field, _spec, _conv in string.Formatter().parse(template))
+
+
+def _render_template(chunks: Tuple[Tuple[str, Optional[str]], ...], values: Dict[str, str]) -> str:
+    parts = []
+    for literal, field in chunks:
+        parts.append(literal)
+        if field is not None:
+            parts.append(values[field])
+    return "".join(parts)
+
+
+_PREFIX_TEMPLATE, _SUFFIX_TEMPLATE = (_compile_template(t) for t in TEMPLATE.split("{body_html}"))
+
+
+def prettify(header: str) -> str:
+    """Insert a space between the Chinese portion and the English abbreviation.
+
+    Headers in the CSV use a convention such as "日期DATE" or "模式MODE".
+    This function detects the first uppercase sequence and inserts a
+    single space before it.  If the header already contains spaces
+    (e.g. "Sent RST"), it is returned unchanged.
+    """
+    header = header.strip()
+    # If there's already a space, assume it's formatted correctly
+    if ' ' in header:
+        return ' '.join(header.split())
+    m = _HEADER_SPLIT.match(header)
+    if not m:
+        return header
+    chinese = m.group(1).strip()
+    english = m.group(2).strip()
+    if chinese:
+        return f"{chinese} {english}"
+    # If the English part starts at index 0, return as is
+    return english
+
+
+class RenderCtx:
+    """Per-page values computed once before the rows are rendered."""
+
+    __slots__ = ("prefix", "suffix", "render_row")
+
+    def __init__(
+        self,
+        prefix: bytes,
+        suffix: bytes,
+        render_row: Callable[[List[str], "_EscapeCache"], bytes],
+    ) -> None:
+        self.prefix = prefix
+        self.suffix = suffix
+        self.render_row = render_row
+
+
+def _build_ctx(headers: List[str], config: dict) -> RenderCtx:
+    """Prepare everything in the page apart from the table rows.
+
+    :param headers: Column names as read from the CSV header row.
+    :param config: Station configuration with at least 'callsign' and 'license'.
+    """
+    # Escaped once here; the callsign fills several template slots (title,
+    # heading, profile and footer), all of them plain chunk joins.
+    callsign = html.escape(str(config.get("callsign", "")).upper())
+    license_class = html.escape(str(config.get("license", "")))
+
+    # Derive table headings and display names.  If a header contains
+    # English names (e.g. "DATE"), insert a space before the English
+    # part.  Otherwise leave as is.  This simple heuristic assumes
+    # uppercase letters denote the English abbreviation.
+    display_headers = [prettify(h) for h in headers]
+
+    # Build table header HTML
+    header_html_parts = []
+    for idx, name in enumerate(display_headers):
+        header_html_parts.append(f'<th onclick="sortTable({idx})">{html.escape(name)}</th>')
+    header_html = "\n                ".join(header_html_parts)
+
+    # Prebuild optional profile lines outside the template; empty fields are omitted
+    profile_lines = []
+    for key, label in PROFILE_FIELDS:
+        value = html.escape(str(config.get(key, "")))
+        if value:
+            profile_lines.append(f"<li><strong>{label}:</strong> {value}</li>")
+    year = datetime.now().year
+
+    prefix = _render_template(_PREFIX_TEMPLATE, {
+        "callsign": callsign,
+        "license_class": license_class,
+        "profile_lines": "\n                ".join(profile_lines),
+        "header_html": header_html,
+    })
+    suffix = _render_template(_SUFFIX_TEMPLATE, {"year": str(year), "callsign": callsign})
+    try:
+        prefix_bytes = prefix.encode("utf-8")
+        suffix_bytes = suffix.encode("utf-8")
+    except UnicodeEncodeError as exc:
+        raise SystemExit(f"Configuration contains text that cannot be encoded as UTF-8: {exc}")
+    return RenderCtx(
+        prefix=prefix_bytes,
+        suffix=suffix_bytes,
+        render_row=_compile_row_renderer(len(headers)),
     )
-    return html_doc
+
+
+class _EscapeCache(dict):
+    """Maps raw cell values to their stripped, escaped UTF-8 bytes.
+
+    Missing values are converted and stored on first lookup, so the
+    generated row renderers can use plain subscription for every cell.
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, value: str) -> bytes:
+        encoded = self[value] = _esc(value.strip()).encode("utf-8")
+        return encoded
+
+
+def _compile_row_renderer(width: int) -> Callable[[List[str], _EscapeCache], bytes]:
+    """Generate a row renderer specialised for a table *width* columns wide.
+
+    The column count is only known once the CSV header has been read, so
+    the renderer is built with exec as a single straight-line join of
+    the row markup and one cache lookup per cell, e.g. for two columns::
+
+        def render_row(row, cache):
+            return b''.join((b'                <tr><td>', cache[row[0]], b'</td><td>', cache[row[1]], b'</td></tr>\\n'))
+
+    This avoids the per-cell loop overhead of a generic renderer.
+    """
+    items = []
+    literal = _TR_OPEN
+    for i in range(width):
+        items.append(repr(literal + _TD_OPEN))
+        items.append(f"cache[row[{i}]]")
+        literal = _TD_CLOSE
+    items.append(repr(literal + _TR_CLOSE))
+    source = f"def render_row(row, cache):\n    return b''.join(({', '.join(items)},))\n"
+    namespace: Dict[str, object] = {}
+    exec(source, namespace)
+    return namespace["render_row"]
+
+
+def _render_rows(ctx: RenderCtx, rows: List[List[str]], write: Callable[[bytearray], object]) -> None:
+    """Render each row as a ``<tr>`` line and pass it, UTF-8 encoded, to *write*.
+
+    This is the hot loop, kept separate from the one-off page setup in
+    _build_ctx so it can be profiled on its own.  Rows are rendered by
+    the schema-specific ctx.render_row into a bytearray that is flushed
+    once it holds about a megabyte.  Log columns repeat heavily (band,
+    mode, RST, date), so each distinct raw value is stripped, escaped
+    and encoded only once per flushed chunk.
+    """
+    # Bind the names used per row to locals to skip repeated global and
+    # attribute lookups in the loop.
+    render_row = ctx.render_row
+    cache = _EscapeCache()
+    buf = bytearray()
+    extend = buf.extend
+    for row in rows:
+        extend(render_row(row, cache))
+        if len(buf) >= _FLUSH_SIZE:
+            write(buf)
+            buf.clear()
+            # Drop cached cells with each flush, so the cache never
+            # holds more than roughly one buffer's worth of values.
+            cache.clear()
+    if buf:
+        write(buf)
+
+
+def _write_page(out: BinaryIO, ctx: RenderCtx, rows: List[List[str]]) -> None:
+    """Write a page prepared by _build_ctx, streaming *rows* into its table."""
+    # Write the fixed prefix, stream the table rows one at a time and
+    # finish with the suffix, so the rendered document is never held in
+    # memory as a whole (the parsed rows still are).
+    out.write(ctx.prefix)
+    _render_rows(ctx, rows, out.write)
+    if not rows:
+        # Keep the blank line an empty table had when rows were newline-joined.
+        out.write(b"\n")
+    out.write(ctx.suffix)
+
+
+def write_html(out: BinaryIO, headers: List[str], rows: List[List[str]], config: dict) -> None:
+    """Write the HTML page, encoded as UTF-8, to an open binary file.
+
+    :param out: Writable binary file receiving the document.
+    :param headers: Column names as read from the CSV header row.
+    :param rows: Contact log entries, each a list of values in header order.
+    :param config: Station configuration with at least 'callsign' and 'license'.
+    """
+    _write_page(out, _build_ctx(headers, config), rows)
 
 
 def main() -> None:
@@ -371,12 +561,14 @@ def main() -> None:
     config_path = Path(args.config)
     output_path = Path(args.output)
     config = load_config(config_path)
-    rows = read_csv(csv_path)
-    html_content = build_html(rows, config)
+    headers, rows = read_csv(csv_path)
+    # Prepare the page before opening the output, so a configuration
+    # that cannot be rendered leaves the previous page untouched.
+    ctx = _build_ctx(headers, config)
     try:
-        with output_path.open("w", encoding="utf-8") as f:
-            f.write(html_content)
-    except Exception as exc:
+        with output_path.open("wb", buffering=1 << 20) as f:
+            _write_page(f, ctx, rows)
+    except OSError as exc:
         raise SystemExit(f"Failed to write output file {output_path}: {exc}")
     print(f"Successfully generated {output_path}")
 